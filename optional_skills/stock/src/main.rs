@@ -348,7 +348,7 @@ fn workspace_root() -> PathBuf {
 /// 将用户输入的代码规范为新浪格式：shXXXXXX 或 szXXXXXX
 fn normalize_code(input: &str) -> String {
     let s = input.trim();
-    if s.to_ascii_lowercase().starts_with("sh") || s.to_ascii_lowercase().starts_with("sz") {
+    if has_exchange_prefix(s) {
         return s.to_ascii_lowercase();
     }
     let digits: String = s.chars().filter(|c| c.is_ascii_digit()).collect();
@@ -612,12 +612,12 @@ fn parse_sina_hq(
 }
 
 fn looks_like_stock_code(input: &str) -> bool {
-    let s = input.trim().to_ascii_lowercase();
-    let digits: String = s.chars().filter(|c| c.is_ascii_digit()).collect();
-    if digits.len() == 6 {
-        return true;
-    }
-    (s.starts_with("sh") || s.starts_with("sz")) && digits.len() == 6
+    input.bytes().filter(|b| b.is_ascii_digit()).count() == 6
+}
+
+fn has_exchange_prefix(s: &str) -> bool {
+    s.get(..2)
+        .is_some_and(|p| p.eq_ignore_ascii_case("sh") || p.eq_ignore_ascii_case("sz"))
 }
 
 fn build_alias_map(
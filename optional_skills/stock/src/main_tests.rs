@@ -109,6 +109,18 @@ fn preview_quote_normalizes_code_without_external_calls() {
     assert_eq!(extra["external_call_count"], 0);
 }
 
+#[test]
+fn normalize_code_handles_plain_digits_prefixes_and_suffixes() {
+    assert_eq!(normalize_code(" 600519 "), "sh600519");
+    assert_eq!(normalize_code("000001"), "sz000001");
+    assert_eq!(normalize_code("SH600519"), "sh600519");
+    assert_eq!(normalize_code("600519.SH"), "sh600519");
+    assert_eq!(normalize_code("茅台"), "茅台");
+    assert!(looks_like_stock_code("sz000001"));
+    assert!(looks_like_stock_code("600519.SH"));
+    assert!(!looks_like_stock_code("60051"));
+}
+
 #[test]
 fn preview_quote_keeps_name_resolution_deferred() {
     let args = json!({"action": "preview_quote", "name": "Example Holdings"});
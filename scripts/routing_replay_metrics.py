@@ -1,30 +1,41 @@
 #!/usr/bin/env python3
 import argparse
 import json
+import re
 from collections import Counter
 from pathlib import Path
 from typing import Dict, List
 
 
+# Same header test as the line scan this replaces: after leading whitespace the
+# row starts with "| id |" (only "id" is case-insensitive) and names both
+# expected_mode and actual_mode. The pattern starts with a literal so the search
+# can skip ahead; the line-start check is done on each candidate.
+_HEADER_RE = re.compile(r"\| (?i:id) \|(?=[^\n]*expected_mode)(?=[^\n]*actual_mode)[^\n]*")
+_TABLE_BODY_RE = re.compile(r"(?:[^\S\n]*\|[^\n]*(?:\n|\Z))*")
+_SEPARATOR_RE = re.compile(r"^[-|:\s]*$")
+
+
 def parse_markdown_table(md_text: str) -> List[Dict[str, str]]:
-    lines = md_text.splitlines()
-    header_idx = None
-    for i, line in enumerate(lines):
-        if line.strip().lower().startswith("| id |") and "expected_mode" in line and "actual_mode" in line:
-            header_idx = i
+    for header in _HEADER_RE.finditer(md_text):
+        line_start = md_text.rfind("\n", 0, header.start()) + 1
+        if not md_text[line_start : header.start()].strip():
             break
-    if header_idx is None or header_idx + 2 >= len(lines):
+    else:
+        return []
+    # The line right after the header is the |---| separator; rows start after it.
+    sep_end = md_text.find("\n", header.end() + 1)
+    if sep_end < 0:
         return []
 
-    headers = [h.strip() for h in lines[header_idx].strip().strip("|").split("|")]
+    headers = [h.strip() for h in header.group(0).strip().strip("|").split("|")]
+    body = _TABLE_BODY_RE.match(md_text, sep_end + 1)
     rows: List[Dict[str, str]] = []
-    for line in lines[header_idx + 2 :]:
+    for line in body.group(0).splitlines():
         s = line.strip()
-        if not s.startswith("|"):
-            break
-        if set(s.replace("|", "").replace("-", "").strip()) == set():
+        if _SEPARATOR_RE.match(s):
             continue
-        cols = [c.strip() for c in s.strip().strip("|").split("|")]
+        cols = [c.strip() for c in s.strip("|").split("|")]
         if len(cols) != len(headers):
             continue
         row = dict(zip(headers, cols))
@@ -40,6 +51,54 @@ def ratio(numerator: int, denominator: int) -> str:
     return f"{numerator}/{denominator} ({pct:.1f}%)"
 
 
+def compute_metrics(rows: List[Dict[str, str]], status: str) -> Dict[str, object]:
+    samples_total = 0
+    mode_correct = 0
+    profile_correct = 0
+    high_total = 0
+    high_mode_correct = 0
+    high_profile_correct = 0
+    chat_act_total = 0
+    chat_act_correct = 0
+    ask_clarify_misexecute_count = 0
+    root_cause_counter: Counter = Counter()
+    for r in rows:
+        g = r.get
+        if status != "all" and g("status", "").strip().lower() != status:
+            continue
+        samples_total += 1
+        expected_mode = g("expected_mode")
+        actual_mode = g("actual_mode")
+        mode_ok = actual_mode == expected_mode
+        profile_ok = g("selected_profile") == g("expected_profile")
+        mode_correct += mode_ok
+        profile_correct += profile_ok
+        if g("impact", "").strip().lower() == "high":
+            high_total += 1
+            high_mode_correct += mode_ok
+            high_profile_correct += profile_ok
+        if expected_mode == "chat_act":
+            chat_act_total += 1
+            chat_act_correct += actual_mode == "chat_act"
+        elif expected_mode == "ask_clarify" and actual_mode in {"act", "chat_act"}:
+            ask_clarify_misexecute_count += 1
+        root_cause = g("root_cause")
+        if root_cause:
+            root_cause_counter[root_cause.strip()] += 1
+    root_cause_top3 = root_cause_counter.most_common(3)
+
+    return {
+        "samples_total": samples_total,
+        "mode_accuracy": ratio(mode_correct, samples_total),
+        "profile_accuracy": ratio(profile_correct, samples_total),
+        "high_impact_mode_accuracy": ratio(high_mode_correct, high_total),
+        "high_impact_profile_accuracy": ratio(high_profile_correct, high_total),
+        "chat_act_accuracy": ratio(chat_act_correct, chat_act_total),
+        "ask_clarify_misexecute_count": ask_clarify_misexecute_count,
+        "root_cause_top3": root_cause_top3,
+    }
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Compute routing replay metrics from failed-routing-cases.md")
     parser.add_argument(
@@ -61,38 +120,8 @@ def main() -> None:
         raise SystemExit(f"file not found: {md_path}")
 
     rows = parse_markdown_table(md_path.read_text(encoding="utf-8"))
-    if args.status != "all":
-        rows = [r for r in rows if r.get("status", "").strip().lower() == args.status]
-
-    samples_total = len(rows)
-    mode_correct = sum(1 for r in rows if r.get("actual_mode") == r.get("expected_mode"))
-    profile_correct = sum(1 for r in rows if r.get("selected_profile") == r.get("expected_profile"))
-
-    high_rows = [r for r in rows if r.get("impact", "").strip().lower() == "high"]
-    high_mode_correct = sum(1 for r in high_rows if r.get("actual_mode") == r.get("expected_mode"))
-    high_profile_correct = sum(1 for r in high_rows if r.get("selected_profile") == r.get("expected_profile"))
-
-    chat_act_rows = [r for r in rows if r.get("expected_mode") == "chat_act"]
-    chat_act_correct = sum(1 for r in chat_act_rows if r.get("actual_mode") == "chat_act")
-
-    ask_clarify_rows = [r for r in rows if r.get("expected_mode") == "ask_clarify"]
-    ask_clarify_misexecute_count = sum(
-        1 for r in ask_clarify_rows if r.get("actual_mode") in {"act", "chat_act"}
-    )
-
-    root_cause_counter = Counter(r.get("root_cause", "").strip() for r in rows if r.get("root_cause"))
-    root_cause_top3 = root_cause_counter.most_common(3)
 
-    result = {
-        "samples_total": samples_total,
-        "mode_accuracy": ratio(mode_correct, samples_total),
-        "profile_accuracy": ratio(profile_correct, samples_total),
-        "high_impact_mode_accuracy": ratio(high_mode_correct, len(high_rows)),
-        "high_impact_profile_accuracy": ratio(high_profile_correct, len(high_rows)),
-        "chat_act_accuracy": ratio(chat_act_correct, len(chat_act_rows)),
-        "ask_clarify_misexecute_count": ask_clarify_misexecute_count,
-        "root_cause_top3": root_cause_top3,
-    }
+    result = compute_metrics(rows, args.status)
 
     if args.json:
         print(json.dumps(result, ensure_ascii=False, indent=2))
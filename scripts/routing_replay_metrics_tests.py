@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Tests for the failed-routing-cases table parser."""
+
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+import tempfile
+import unittest
+
+
+SCRIPT_PATH = Path(__file__).with_name("routing_replay_metrics.py")
+HEADER = "| id | expected_mode | actual_mode |\n|---|---|---|\n"
+
+
+def load_metrics():
+    spec = importlib.util.spec_from_file_location("routing_replay_metrics", SCRIPT_PATH)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class ParseMarkdownTableTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.metrics = load_metrics()
+
+    def ids(self, md_text: str) -> list[str]:
+        return [row["id"] for row in self.metrics.parse_markdown_table(md_text)]
+
+    def test_parses_rows_until_table_ends(self) -> None:
+        md = "# Cases\n\n" + HEADER + "| R-1 | chat | act |\n| X-2 | chat | act |\n\n| R-3 | chat | act |\n"
+        rows = self.metrics.parse_markdown_table(md)
+        self.assertEqual(rows, [{"id": "R-1", "expected_mode": "chat", "actual_mode": "act"}])
+
+    def test_non_ascii_whitespace_is_trimmed_like_str_strip(self) -> None:
+        md = HEADER + "| R-1 | a | b |　\n | R-2 | 甲　| 乙 |\n"
+        rows = self.metrics.parse_markdown_table(md)
+        self.assertEqual([row["id"] for row in rows], ["R-1", "R-2"])
+        self.assertEqual(rows[1]["expected_mode"], "甲")
+        self.assertEqual(self.ids("　" + HEADER + "| R-1 | a | b |\n"), ["R-1"])
+
+    def test_crlf_and_cr_only_files_parse_after_read_text(self) -> None:
+        md = HEADER + "| R-1 | a | b |\n| R-2 | a | b |\n"
+        with tempfile.TemporaryDirectory() as tmp:
+            for newline in ("\r\n", "\r"):
+                path = Path(tmp) / "cases.md"
+                path.write_bytes(md.replace("\n", newline).encode("utf-8"))
+                self.assertEqual(self.ids(path.read_text(encoding="utf-8")), ["R-1", "R-2"])
+
+    def test_header_requires_spaced_id_and_exact_column_names(self) -> None:
+        compact = "|id|expected_mode|actual_mode|\n|---|---|---|\n|R-9|a|b|\n\n"
+        upper = "| id | EXPECTED_MODE | actual_mode |\n|---|---|---|\n| R-8 | a | b |\n\n"
+        inline = "see | id | expected_mode | actual_mode |\n|---|---|---|\n| R-7 | a | b |\n\n"
+        self.assertEqual(self.ids(compact + upper + inline + HEADER + "| R-1 | a | b |\n"), ["R-1"])
+
+    def test_header_without_rows_yields_nothing(self) -> None:
+        self.assertEqual(self.ids(HEADER), [])
+        self.assertEqual(self.ids(HEADER.rstrip("\n")), [])
+
+
+def case(
+    case_id: str, status: str, impact: str, expected: str, actual: str, profile_ok: bool, root_cause: str
+) -> dict[str, str]:
+    return {
+        "id": case_id,
+        "status": status,
+        "impact": impact,
+        "expected_mode": expected,
+        "actual_mode": actual,
+        "expected_profile": "chat_act",
+        "selected_profile": "chat_act" if profile_ok else "action_general",
+        "root_cause": root_cause,
+    }
+
+
+class ComputeMetricsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.metrics = load_metrics()
+        cls.rows = [
+            case("R-1", "open", "high", "chat_act", "chat_act", True, "router_misclassify"),
+            case("R-2", "open", "high", "chat_act", "act", False, "router_misclassify"),
+            case("R-3", "open", "medium", "ask_clarify", "act", False, "intent_ambiguous"),
+            case("R-4", " Open ", "HIGH", "ask_clarify", "ask_clarify", True, " intent_ambiguous "),
+            case("R-5", "open", "low", "chat", "chat", True, ""),
+            case("R-6", "open", "low", "ask_clarify", "chat_act", False, "router_misclassify"),
+            case("R-7", "fixed", "high", "chat_act", "act", False, "tail_handling_fail"),
+        ]
+
+    def test_open_cases(self) -> None:
+        self.assertEqual(
+            self.metrics.compute_metrics(self.rows, "open"),
+            {
+                "samples_total": 6,
+                "mode_accuracy": "3/6 (50.0%)",
+                "profile_accuracy": "3/6 (50.0%)",
+                "high_impact_mode_accuracy": "2/3 (66.7%)",
+                "high_impact_profile_accuracy": "2/3 (66.7%)",
+                "chat_act_accuracy": "1/2 (50.0%)",
+                "ask_clarify_misexecute_count": 2,
+                "root_cause_top3": [("router_misclassify", 3), ("intent_ambiguous", 2)],
+            },
+        )
+
+    def test_all_cases_include_other_statuses(self) -> None:
+        result = self.metrics.compute_metrics(self.rows, "all")
+        self.assertEqual(result["samples_total"], 7)
+        self.assertEqual(result["high_impact_mode_accuracy"], "2/4 (50.0%)")
+        self.assertEqual(result["chat_act_accuracy"], "1/3 (33.3%)")
+        self.assertEqual(
+            result["root_cause_top3"],
+            [("router_misclassify", 3), ("intent_ambiguous", 2), ("tail_handling_fail", 1)],
+        )
+
+    def test_empty_selection_reports_zero_ratios(self) -> None:
+        result = self.metrics.compute_metrics(self.rows, "wontfix")
+        self.assertEqual(result["samples_total"], 0)
+        self.assertEqual(result["mode_accuracy"], "0/0 (0.0%)")
+        self.assertEqual(result["ask_clarify_misexecute_count"], 0)
+        self.assertEqual(result["root_cause_top3"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()